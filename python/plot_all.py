@@ -0,0 +1,21 @@
+"""Plot All Benchmark Results
+
+This script builds both the random access and the space usage plots in a single run, so that the
+fixed costs of importing pandas and plotly and of starting Kaleido for the SVG export (when
+EXPORT_SVG=1) are paid only once, instead of once per plotting script.
+"""
+
+import plot_random_access
+import plot_space
+from plot_common import run
+
+PLOTS = [plot_random_access, plot_space]
+
+
+def main():
+    """Build, display and save every benchmark plot."""
+    run(PLOTS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+"""Shared helpers for the benchmark plotting scripts.
+
+load_means() turns a benchmark CSV into the standard vector measurement and a (k x codec) table
+of means. With polars installed this runs as a single lazy polars query; otherwise pandas reads the
+CSV, with the pyarrow reader and a Parquet copy kept next to the CSV when pyarrow is available.
+
+plot_line() draws one line per codec. Codecs measured on more than MAX_POINTS sample sizes are
+thinned with LTTB when the optional plotly-resampler package is installed.
+
+cached_figure() caches built figures as JSON under .cache/, keyed by a hash of the CSV and of the
+plotting code, so re-running a script on unchanged results skips the pandas and plotly work.
+
+save_figures() writes the HTML files, and the SVG images only when EXPORT_SVG=1, since the SVG
+export has to start Kaleido and is by far the slowest step.
+"""
+
+import hashlib
+import importlib.metadata
+import importlib.util
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import polars as pl
+
+    HAS_POLARS = True
+
+    # Polars equivalents of the pandas column types used by the plotting scripts.
+    _POLARS_TYPES = {
+        'string': pl.String,
+        'int32': pl.Int32,
+        'int64': pl.Int64,
+        'float64': pl.Float64,
+    }
+except ImportError:
+    HAS_POLARS = False
+
+# plotly-resampler pulls in dash and tsdownsample, so LTTB is only imported by _downsample() when
+# a trace is actually long enough to be thinned.
+HAS_RESAMPLER = importlib.util.find_spec("plotly_resampler") is not None
+
+# Whether the SVG images should be exported along with the HTML files.
+EXPORT_SVG = os.environ.get("EXPORT_SVG") == "1"
+
+# Above this number of sample sizes, the traces are downsampled with LTTB before plotting.
+MAX_POINTS = 200
+
+# Directory where the built figures are cached as JSON.
+CACHE_DIR = Path(".cache")
+
+# Prefixes removed, in order, from the benchmark names to get the codec base names.
+CODEC_PREFIXES = ("LEIntVec ", "BEIntVec ")
+# Prefixes and suffixes additionally removed from the codec base names when strip_affixes is set.
+AFFIX_PREFIXES = ("Param",)
+AFFIX_SUFFIXES = ("Codec",)
+
+
+def load_bench(csv_path, usecols=None, dtype=None):
+    """
+    Load a benchmark CSV file, going through a cached Parquet copy when possible.
+
+    If a sibling '.parquet' file exists, is not older than the CSV and has all the requested
+    columns, it is read instead of the CSV. Otherwise the whole CSV is parsed and the Parquet copy
+    is (re)written for the next run, so that later calls asking for other columns can use it too;
+    failing to write it (e.g. in a read-only directory) only skips the caching. Without pyarrow
+    installed, the CSV is always read with pd.read_csv.
+
+    This is the pandas fallback of load_means(): when polars is installed, load_means() scans the
+    CSV with polars instead, and neither the Parquet copy nor the pyarrow CSV reader are used.
+
+    Args:
+        csv_path (str | Path): Path to the benchmark CSV file.
+        usecols (list[str] | None): Columns to load. All the columns are loaded if None.
+        dtype (dict[str, str] | None): Explicit column types, skipping pandas' type inference.
+
+    Returns:
+        pd.DataFrame: The benchmark results.
+    """
+    csv_path = Path(csv_path)
+    if not HAS_PYARROW:
+        return _read_csv(csv_path, usecols, dtype)
+
+    pq = csv_path.with_suffix(".parquet")
+    if pq.exists() and pq.stat().st_mtime >= csv_path.stat().st_mtime:
+        cached_columns = pyarrow.parquet.read_schema(pq).names
+        if usecols is None or set(usecols) <= set(cached_columns):
+            # The Parquet copy may have been written with other column types (the cache is only
+            # checked by mtime), so the requested types are still applied; a no-op when they match.
+            df = pd.read_parquet(pq, engine="pyarrow", columns=usecols)
+            return df.astype(dtype) if dtype else df
+
+    df = _read_csv(csv_path, None, dtype)
+    try:
+        df.to_parquet(pq, engine="pyarrow", compression="zstd")
+    except OSError:
+        pass
+    return df[usecols] if usecols is not None else df
+
+
+def _read_csv(csv_path, usecols, dtype):
+    """
+    Parse a benchmark CSV file, loading only the requested columns.
+
+    The multi-threaded pyarrow CSV reader is used when available, the pandas C engine otherwise.
+    """
+    engine = "pyarrow" if HAS_PYARROW else "c"
+    return pd.read_csv(csv_path, usecols=usecols, dtype=dtype, engine=engine)
+
+
+def split_standard(df, column):
+    """
+    Extract the standard vector measurement (sample size k == 0) and drop its row in place.
+
+    Args:
+        df (pd.DataFrame): The benchmark results.
+        column (str): Name of the measurement column.
+
+    Returns:
+        The measurement of the standard vector.
+
+    Raises:
+        ValueError: If there is no row with k == 0.
+    """
+    # The same mask is used both to locate the value and to drop the row. argmax stops at the first
+    # match, and the value is read straight from the NumPy array without building a filtered frame.
+    is_standard = df['k'].to_numpy() == 0
+    i = is_standard.argmax()
+    if not is_standard[i]:
+        raise ValueError("no standard vector row (k == 0) in the benchmark results")
+    standard = df[column].to_numpy()[i]
+    df.drop(df.index[is_standard], inplace=True)
+    return standard
+
+
+def clean_codec(names, strip_affixes=False):
+    """
+    Clean codec names by removing the CODEC_PREFIXES ('LEIntVec ' or 'BEIntVec ').
+
+    The names are cleaned once per distinct codec with vectorized string operations and mapped
+    back onto the rows.
+
+    Args:
+        names (pd.Series): The benchmark names.
+        strip_affixes (bool): Also remove the AFFIX_PREFIXES and AFFIX_SUFFIXES ('Param' prefix,
+            'Codec' suffix).
+
+    Returns:
+        pd.Series: The cleaned codec names, as a categorical.
+    """
+    prefixes, suffixes = _codec_affixes(strip_affixes)
+    uniq = pd.Series(names.unique())
+    codec_bases = uniq
+    for prefix in prefixes:
+        codec_bases = codec_bases.str.removeprefix(prefix)
+    for suffix in suffixes:
+        codec_bases = codec_bases.str.removesuffix(suffix)
+    codec_bases = codec_bases.str.strip()
+    return names.map(dict(zip(uniq, codec_bases))).astype('category')
+
+
+def _codec_affixes(strip_affixes):
+    """Prefixes and suffixes to remove from the benchmark names, shared by both engines."""
+    if strip_affixes:
+        return CODEC_PREFIXES + AFFIX_PREFIXES, AFFIX_SUFFIXES
+    return CODEC_PREFIXES, ()
+
+
+def mean_by_codec(df, values):
+    """
+    Pivot the benchmark results into a (k x codec base) table of mean measurements.
+
+    Pivoting on the categorical 'codec_base' column avoids rehashing the codec name strings, and
+    the table is factorized only once: each column holds the y values of one trace, with NaN for
+    the sample sizes the codec was not measured on. observed=True skips the empty codec and k
+    categories. The rows are sorted by k, so the lines are drawn in order of sample size whatever
+    the order of the CSV rows, and the columns (i.e. the legend) are sorted by codec base.
+
+    Args:
+        df (pd.DataFrame): The benchmark results, with a 'codec_base' column.
+        values (str): Name of the measurement column to average.
+
+    Returns:
+        pd.DataFrame: The mean measurements, indexed by k with one column per codec base.
+    """
+    return df.pivot_table(
+        index='k',
+        columns='codec_base',
+        values=values,
+        aggfunc='mean',
+        observed=True
+    ).sort_index().sort_index(axis=1)
+
+
+def load_means(csv_path, column, dtype, strip_affixes=False):
+    """
+    Load a benchmark CSV file and average its measurements per codec base and sample size.
+
+    With polars installed, the CSV is scanned lazily and the filtering, codec name cleaning and
+    group-by are planned and run as one multi-threaded query; the Parquet copy and the pyarrow CSV
+    reader of load_bench() are then not used. Otherwise the pandas helpers above are used, going
+    through the cached Parquet copy of the CSV. Both engines clean the codec names with the same
+    CODEC_PREFIXES, AFFIX_PREFIXES and AFFIX_SUFFIXES.
+
+    Args:
+        csv_path (str | Path): Path to the benchmark CSV file.
+        column (str): Name of the measurement column.
+        dtype (dict[str, str]): Types of the 'name', 'k' and measurement columns, applied by the
+            CSV parser itself.
+        strip_affixes (bool): Also remove the 'Param' prefix and the 'Codec' suffix from the codecs.
+
+    Returns:
+        tuple: The standard vector measurement and the mean measurements, indexed by k with one
+        column per codec base (as returned by mean_by_codec()).
+    """
+    if HAS_POLARS:
+        return _load_means_polars(csv_path, column, dtype, strip_affixes)
+
+    df = load_bench(csv_path, usecols=['name', 'k', column], dtype=dtype)
+    standard = split_standard(df, column)
+    df['codec_base'] = clean_codec(df['name'], strip_affixes)
+    return standard, mean_by_codec(df, column)
+
+
+def _load_means_polars(csv_path, column, dtype, strip_affixes):
+    """Polars implementation of load_means()."""
+    schema = {name: _POLARS_TYPES[t] for name, t in dtype.items()}
+    lf = pl.scan_csv(csv_path, schema_overrides=schema).select('name', 'k', column)
+
+    prefixes, suffixes = _codec_affixes(strip_affixes)
+    codec_base = pl.col('name')
+    for prefix in prefixes:
+        codec_base = codec_base.str.strip_prefix(prefix)
+    for suffix in suffixes:
+        codec_base = codec_base.str.strip_suffix(suffix)
+    codec_base = codec_base.str.strip_chars().alias('codec_base')
+
+    standard_lf = lf.filter(pl.col('k') == 0).select(column).head(1)
+    means_lf = (
+        lf.filter(pl.col('k') != 0)
+        .with_columns(codec_base)
+        .group_by('codec_base', 'k')
+        .agg(pl.col(column).mean())
+    )
+    # Both queries share the CSV scan.
+    standard, means = pl.collect_all([standard_lf, means_lf])
+    if standard.is_empty():
+        raise ValueError("no standard vector row (k == 0) in the benchmark results")
+
+    # The pandas frame is built from NumPy arrays: DataFrame.to_pandas() would require pyarrow.
+    # Same order as mean_by_codec(): rows sorted by k, columns sorted by codec base.
+    wide = means.sort('k').pivot(on='codec_base', index='k', values=column)
+    codec_bases = sorted(name for name in wide.columns if name != 'k')
+    df_total = pd.DataFrame(
+        wide.select(codec_bases).to_numpy(),
+        index=pd.Index(wide['k'].to_numpy(), name='k'),
+        columns=pd.Index(codec_bases, name='codec_base')
+    )
+    return standard.item(), df_total
+
+
+def plot_line(df_total, standard, title, subtitle, y_label, height, width):
+    """
+    Create a line plot of a mean measurement versus sample size, one trace per codec.
+
+    The traces are built directly from NumPy arrays, skipping the generic DataFrame processing done
+    by plotly express, and thinned with LTTB when they have more than MAX_POINTS points. They are
+    SVG scatter plots rather than WebGL ones, so the exported SVG images stay vector graphics. A
+    horizontal dashed line marks the standard vector.
+
+    Args:
+        df_total (pd.DataFrame): The mean measurements, as returned by mean_by_codec().
+        standard (float): The standard vector measurement.
+        title (str): Title of the plot.
+        subtitle (str): Subtitle of the plot.
+        y_label (str): Label of the y axis.
+        height (int): Height of the figure in pixels.
+        width (int): Width of the figure in pixels.
+
+    Returns:
+        go.Figure: The line plot.
+    """
+    fig = go.Figure()
+    for codec_base in df_total.columns:
+        # The pivot holds NaN for the sample sizes a codec was not measured on: drop them, so that
+        # the line goes through the points the codec actually has and LTTB never sees NaN.
+        means = df_total[codec_base].dropna()
+        x, y = _downsample(means.index.to_numpy(), means.to_numpy())
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=y,
+            mode="lines+markers",
+            name=codec_base
+        ))
+    fig.update_layout(
+        title={"text": title, "subtitle": {"text": subtitle}},
+        xaxis_title="Sample Size (k)",
+        yaxis_title=y_label,
+        legend_title_text="Codec Base",
+        height=height,
+        width=width
+    )
+
+    fig.add_hline(
+        y=standard,
+        line_dash="dash",
+        line_color="black",
+        annotation_text="Standard Vec",
+        annotation_position="bottom right"
+    )
+    return fig
+
+
+def _downsample(x, y):
+    """Thin a trace to MAX_POINTS points with LTTB, if it is longer and plotly-resampler is available."""
+    if not HAS_RESAMPLER or len(x) <= MAX_POINTS:
+        return x, y
+    from plotly_resampler.aggregation import LTTB
+
+    idx = LTTB().arg_downsample(x, y, n_out=MAX_POINTS)
+    return x[idx], y[idx]
+
+
+def cached_figure(csv_path, build):
+    """
+    Build a figure from a benchmark CSV file, reusing the cached figure when possible.
+
+    The cache key is a hash of the CSV contents, of the source file defining `build`, of this
+    module and of the LTTB settings (whether plotly-resampler is installed and MAX_POINTS), so the
+    figure is rebuilt whenever the benchmark results, the plotting code or the traces change. The
+    cache files are named after the source file of `build`, and writing a new figure removes the
+    stale ones of the same plot.
+
+    Args:
+        csv_path (str | Path): Path to the benchmark CSV file.
+        build (Callable[[str | Path], go.Figure]): Function building the figure from the CSV path.
+
+    Returns:
+        go.Figure: The (possibly cached) figure.
+    """
+    source = Path(inspect.getsourcefile(build))
+    key = hashlib.blake2b(Path(csv_path).read_bytes())
+    key.update(source.read_bytes())
+    key.update(Path(__file__).read_bytes())
+    key.update(f"{HAS_RESAMPLER}:{MAX_POINTS}".encode())
+    cache = CACHE_DIR / f"fig_{source.stem}_{key.hexdigest()[:16]}.json"
+    if cache.exists():
+        return pio.from_json(cache.read_text())
+
+    fig = build(csv_path)
+    CACHE_DIR.mkdir(exist_ok=True)
+    for stale in CACHE_DIR.glob(f"fig_{source.stem}_*.json"):
+        stale.unlink()
+    cache.write_text(fig.to_json())
+    return fig
+
+
+def write_svgs(figs, paths):
+    """
+    Export figures as SVG images, sharing a single Kaleido browser process between all of them.
+
+    Args:
+        figs (list[go.Figure | dict]): The figures to export.
+        paths (list[str | Path]): Output path of the SVG image of each figure.
+    """
+    # plotly.io.write_images() needs both plotly >= 6.1 and Kaleido >= 1. With Kaleido 0.2.x (which
+    # bundles its own Chromium), the figures are exported one at a time: that version keeps a
+    # persistent Kaleido scope across write_image calls.
+    if hasattr(pio, "write_images") and _kaleido_major_version() >= 1:
+        pio.write_images(figs, paths, format="svg")
+    else:
+        for fig, path in zip(figs, paths):
+            pio.write_image(fig, path, format="svg")
+
+
+def _kaleido_major_version():
+    """Major version of the installed Kaleido package, or 0 if it is missing."""
+    try:
+        return int(importlib.metadata.version("kaleido").split(".")[0])
+    except (importlib.metadata.PackageNotFoundError, ValueError):
+        return 0
+
+
+def run(plots):
+    """
+    Build, display and save the figures of the given plotting scripts.
+
+    Each figure is reused from the cache when neither its CSV nor its plotting code have changed,
+    and all the figures are saved at once, sharing a single Kaleido process for the SVG images.
+
+    Args:
+        plots (list[module]): Plotting script modules, each defining CSV_PATH, SVG_PATH,
+            HTML_PATH and build_figure(csv).
+    """
+    figs = [cached_figure(plot.CSV_PATH, plot.build_figure) for plot in plots]
+
+    # Display the interactive plots.
+    for fig in figs:
+        fig.show()
+
+    # The SVG export is skipped unless EXPORT_SVG=1, since it has to start Kaleido.
+    save_figures(
+        figs,
+        [plot.SVG_PATH for plot in plots],
+        [plot.HTML_PATH for plot in plots],
+    )
+
+
+def save_figures(figs, svg_paths, html_paths):
+    """
+    Save figures as interactive HTML files and, if EXPORT_SVG is set, as SVG images.
+
+    When the SVG images are exported, the HTML files are written while Kaleido renders them: the
+    export mostly waits on the Kaleido subprocess, so a thread is enough to overlap the two. The
+    export thread works on dict copies of the figures taken beforehand, so it never reads the
+    figure objects used by the HTML writes.
+
+    Args:
+        figs (list[go.Figure]): The figures to save.
+        svg_paths (list[str | Path]): Output path of the SVG image of each figure.
+        html_paths (list[str | Path]): Output path of the HTML file of each figure.
+    """
+    if not EXPORT_SVG:
+        _write_htmls(figs, html_paths)
+        return
+
+    svg_figs = [fig.to_dict() for fig in figs]
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        svgs = executor.submit(write_svgs, svg_figs, svg_paths)
+        _write_htmls(figs, html_paths)
+        svgs.result()
+
+
+def _write_htmls(figs, paths):
+    """
+    Write each figure to its interactive HTML file.
+
+    plotly.js is loaded from the CDN instead of being embedded (~3MB) in every file, MathJax is not
+    used by the plots, and the figures are already valid, so plotly's validation is skipped.
+    """
+    for fig, path in zip(figs, paths):
+        fig.write_html(
+            path,
+            include_plotlyjs="cdn",
+            include_mathjax=False,
+            full_html=True,
+            validate=False
+        )
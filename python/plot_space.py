@@ -2,98 +2,69 @@
 This script reads CSV data about space usage from various codecs and plots a line chart comparing
 the space usage (in kB) for different codecs as sample size k increases. It also adds a horizontal
 reference line for a "Standard Vec" (the baseline measurement) and writes the resulting plot as both
-SVG and HTML files.
+SVG (only when EXPORT_SVG=1) and HTML files.
 
 The CSV is expected to contain at least the following columns:
 - 'name': Name of the codec.
 - 'k': Sample size identifier (with k = 0 representing the standard vector).
 - 'space': The space usage in bytes.
 
-The codec names are processed to remove unnecessary prefixes/suffixes via the extract_codec_base() function.
+The codec names are processed to remove unnecessary prefixes/suffixes via the load_means() function.
 """
 
-import pandas as pd
-import plotly.express as px
+import sys
 
-# Read the CSV file containing benchmark results.
-# The CSV file includes a 'space' column (in bytes) and other columns such as 'k' and 'name'.
-df = pd.read_csv("../bench_results/bench_space.csv")
+from plot_common import load_means, plot_line, run
 
-# Extract the baseline "Standard Vec" (where k == 0) and convert its space usage from byte to kB.
-standard_row = df[df['k'] == 0].iloc[0]
-standard_vec = standard_row['space']  # value in byte
-standard_vec_kb = standard_vec / 1024  # convert to kilobytes
+CSV_PATH = "../bench_results/bench_space.csv"
+SVG_PATH = "../images/space/space_total_10k.svg"
+HTML_PATH = "../images/space/space_total_10k.html"
 
-# Remove the baseline row from the dataframe so it doesn't interfere with plotting.
-df = df[df['k'] != 0].copy()
 
-# Ensure that the 'k' column is numeric.
-df['k'] = pd.to_numeric(df['k'])
-# Create a new column 'space_kb' by converting 'space' from bytes to kilobytes.
-df['space_kb'] = df['space'] / 1024
-
-# Define a helper function to extract the base name of the codec, removing unnecessary prefixes and suffixes.
-def extract_codec_base(name):
-    """
-    Process the codec name to remove specific prefixes and suffixes:
-    - Remove "LEIntVec " or "BEIntVec " prefix.
-    - Remove "Param" prefix if present.
-    - Remove "Codec" suffix if present.
-    Returns the cleaned codec name.
+def build_figure(csv):
     """
-    # Remove "LEIntVec " or "BEIntVec " prefix.
-    if name.startswith("LEIntVec "):
-        s = name[len("LEIntVec "):]
-    elif name.startswith("BEIntVec "):
-        s = name[len("BEIntVec "):]
-    else:
-        s = name
-    # Remove "Param" if present.
-    if s.startswith("Param"):
-        s = s[len("Param"):]
-    # Remove "Codec" suffix if present.
-    if s.endswith("Codec"):
-        s = s[:-len("Codec")]
-    return s.strip()
+    Build the space usage plot from a benchmark CSV file.
 
-# Add a new column 'codec_base' with the cleaned codec names.
-df['codec_base'] = df['name'].apply(extract_codec_base)
+    Args:
+        csv (str): Path to the space benchmark CSV file.
 
-# --- Plotting the Total Space Usage per Codec ---
-# Group the data by the cleaned codec base and 'k', aggregating the space usage (in kB) using mean.
-df_total = df.groupby(['codec_base', 'k'], as_index=False)['space_kb'].mean()
+    Returns:
+        go.Figure: The space usage plot.
+    """
+    # Read the CSV file containing benchmark results.
+    # The CSV file includes a 'space' column (in bytes) and other columns such as 'k' and 'name'.
+    # The baseline "Standard Vec" (where k == 0) is extracted, and the other measurements are
+    # averaged per codec base and sample size, after cleaning the codec names:
+    # - Remove "LEIntVec " or "BEIntVec " prefix.
+    # - Remove "Param" prefix if present.
+    # - Remove "Codec" suffix if present.
+    standard_vec, df_total = load_means(
+        csv,
+        'space',
+        dtype={'name': 'string', 'k': 'int32', 'space': 'int64'},
+        strip_affixes=True,
+    )  # values in byte
 
-# Create a line plot using Plotly Express.
-# The x-axis represents 'k' (sample size), and the y-axis represents average space usage (in kB).
-fig_total = px.line(
-    df_total,
-    x="k",
-    y="space_kb",
-    color="codec_base",
-    markers=True,
-    title="Space Usage per Codec",
-    subtitle="Vector with 10k random elements with uniform distribution in the range [0, 10_000)",
-    labels={
-        "k": "Sample Size (k)",
-        "space_kb": "Space Usage (kB)",
-        "codec_base": "Codec Base"
-    },
-    height=900,
-    width=1200
-)
+    # --- Plotting the Total Space Usage per Codec ---
+    # Convert the baseline space usage from byte to kB.
+    standard_vec_kb = standard_vec / 1024  # convert to kilobytes
+    # Convert the mean space usage from bytes to kilobytes. The mean is computed on the raw integer
+    # column, so only the aggregated values need to be converted.
+    df_total /= 1024
 
-# Add a horizontal dashed line representing the "Standard Vec" baseline value.
-fig_total.add_hline(
-    y=standard_vec_kb,
-    line_dash="dash",
-    line_color="black",
-    annotation_text="Standard Vec",
-    annotation_position="bottom right"
-)
+    # Create a line plot, one trace per codec, with a horizontal dashed line representing the
+    # "Standard Vec" baseline value.
+    # The x-axis represents 'k' (sample size), and the y-axis represents average space usage (in kB).
+    return plot_line(
+        df_total,
+        standard_vec_kb,
+        title="Space Usage per Codec",
+        subtitle="Vector with 10k random elements with uniform distribution in the range [0, 10_000)",
+        y_label="Space Usage (kB)",
+        height=900,
+        width=1200
+    )
 
-# Display the plotted figure.
-fig_total.show()
 
-# Save the plot as an SVG image and an interactive HTML file in the specified directory.
-fig_total.write_image("../images/space/space_total_10k.svg")
-fig_total.write_html("../images/space/space_total_10k.html")
+if __name__ == "__main__":
+    run([sys.modules[__name__]])